@@ -1,36 +1,207 @@
 
 """
 Flight Routes Visualization Generator
-Creates a standalone interactive HTML map with embedded data.
+Creates an interactive HTML map plus the content-hashed data files it loads.
 """
 
+import numpy as np
 import pandas as pd
 import geopandas as gpd
+import requests
+import orjson
+import brotli
+import hashlib
+import gzip
+import glob
+import re
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
 
+# Read vector data through GDAL + Arrow instead of Fiona's row-by-row reader
+gpd.options.io_engine = "pyogrio"
+
 # Data URLs
 ROUTE_URL = "https://github.com/opengeos/datasets/releases/download/world/airport_routes.csv"
 AIRPORT_URL = "https://github.com/opengeos/datasets/releases/download/world/airports.geojson"
 
+# Downloaded data is kept here between runs
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "flight")
+
+def fetch(url):
+    """Return a local path for url, re-downloading only when the remote file changed."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    
+    # Key the cache by URL, keeping the extension so readers can sniff the format
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+    path = os.path.join(CACHE_DIR, f"{key}-{os.path.basename(url)}")
+    meta_path = path + ".meta.json"
+    
+    # Send the validators from the last download so the server can answer 304.
+    # An unreadable meta file just means there are no validators to send
+    headers = {}
+    if os.path.exists(path):
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        if not isinstance(meta, dict):
+            meta = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    
+    # Download to a temp file first so an interrupted download never looks cached
+    tmp_path = path + ".part"
+    try:
+        # requests.get uses its own session, so fetch is safe to call from several threads
+        with requests.get(url, headers=headers, stream=True, timeout=60) as resp:
+            if resp.status_code == 304:
+                return path
+            resp.raise_for_status()
+            with open(tmp_path, "wb") as f:
+                for chunk in resp.iter_content(chunk_size=1 << 20):
+                    f.write(chunk)
+            meta = {
+                "url": url,
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            }
+        os.replace(tmp_path, path)
+    except requests.RequestException:
+        # Offline, server error or broken transfer: fall back to the last good download
+        if os.path.exists(path):
+            print(f"Download failed, using cached {os.path.basename(url)}")
+            return path
+        raise
+    finally:
+        # Only left behind if the download failed part way
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    # Write the validators atomically too, so a crash can't leave a truncated meta file
+    tmp_meta_path = meta_path + ".part"
+    with open(tmp_meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_meta_path, meta_path)
+    
+    return path
+
+def write_output(path, data):
+    """Write data to path plus precompressed .gz and .br copies for static hosting."""
+    with open(path, "wb") as f:
+        f.write(data)
+    
+    # mtime=0 keeps the gzip output byte-identical between runs
+    with open(path + ".gz", "wb") as f:
+        f.write(gzip.compress(data, compresslevel=9, mtime=0))
+    with open(path + ".br", "wb") as f:
+        f.write(brotli.compress(data, quality=11))
+
+def write_asset(output_dir, name, ext, data):
+    """Write data as a content-hashed file in output_dir and return its file name."""
+    digest = hashlib.md5(data).hexdigest()[:12]
+    filename = f"{name}.{digest}{ext}"
+    
+    # Remove copies of this asset left behind by earlier runs, touching only
+    # names this function produces: <name>.<12 hex><ext>[.gz|.br]
+    asset_pattern = re.compile(rf"{re.escape(name)}\.[0-9a-f]{{12}}{re.escape(ext)}(\.gz|\.br)?")
+    for old_path in glob.glob(os.path.join(glob.escape(output_dir), f"{glob.escape(name)}.*")):
+        basename = os.path.basename(old_path)
+        if asset_pattern.fullmatch(basename) and not basename.startswith(filename):
+            os.remove(old_path)
+    
+    write_output(os.path.join(output_dir, filename), data)
+    return filename
+
+def load_airports():
+    """Download and read the airports, keeping only the columns the page uses."""
+    # GDAL parses the whole file either way, so only the column selection is pushed down
+    return gpd.read_file(
+        fetch(AIRPORT_URL),
+        engine="pyogrio",
+        use_arrow=True,
+        columns=["id", "name"],
+    )
+
 def generate_html(output_file="index.html"):
     print("Loading data...")
     
     # Load Routes
-    df = pd.read_csv(ROUTE_URL)
-    # Keep only necessary columns to reduce size
+    # Only parse the columns we need, with a compact schema, on Arrow's multithreaded reader
     route_cols = ["src_airport", "dst_airport", "src_lat", "src_lon", "dst_lat", "dst_lon", "src_name", "src_country"]
-    df = df[route_cols]
+    route_dtypes = {
+        "src_airport": "category",
+        "dst_airport": "category",
+        "src_lat": "float64",
+        "src_lon": "float64",
+        "dst_lat": "float64",
+        "dst_lon": "float64",
+    }
+    # Routes and airports are independent, so download and parse the airports on a
+    # worker thread while the routes are fetched and parsed here
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        airports_load = executor.submit(load_airports)
+        df = pd.read_csv(fetch(ROUTE_URL), usecols=route_cols, dtype=route_dtypes, engine="pyarrow")
+        gdf = airports_load.result()
+    
+    print(f"Loaded {len(df)} routes.")
+    
+    # 4 decimal places (~11 m) is plenty for a global arc map; rounding at full
+    # precision before the float32 downcast keeps the serialized numbers short
+    coord_cols = ["src_lat", "src_lon", "dst_lat", "dst_lon"]
+    df[coord_cols] = df[coord_cols].round(4).astype("float32")
+    
+    # Share one sorted set of categories between src and dst so both columns
+    # use the same integer codes; the page resolves codes[i] back to the string
+    airport_codes = df["src_airport"].cat.categories.union(df["dst_airport"].cat.categories).sort_values()
+    code_dtype = pd.CategoricalDtype(airport_codes)
+    df["src_airport"] = df["src_airport"].astype(code_dtype)
+    df["dst_airport"] = df["dst_airport"].astype(code_dtype)
     
-    # Convert to list of dicts for JSON embedding
-    routes_data = df.to_dict(orient="records")
-    print(f"Loaded {len(routes_data)} routes.")
+    # Routes without both endpoints can't be drawn (and would have code -1)
+    df = df.dropna(subset=["src_airport", "dst_airport"])
+    
+    # Struct-of-arrays layout for JSON embedding: rows are grouped by source airport
+    # and by_src maps each airport code to its contiguous row range [start, end).
+    # Grouping is a stable sort of the integer category codes, so no string hashing
+    src_codes = df["src_airport"].cat.codes.to_numpy()
+    order = np.argsort(src_codes, kind="stable")
+    counts = np.bincount(src_codes, minlength=len(airport_codes))
+    ends = np.cumsum(counts)
+    routes_by_src = {
+        code: [int(end - count), int(end)]
+        for code, count, end in zip(airport_codes, counts, ends)
+        if count
+    }
+    grouped = df.iloc[order]
+    # Columns stay NumPy arrays (float32 / int16); orjson serializes them directly
+    routes_data = {
+        "codes": airport_codes.tolist(),
+        "by_src": routes_by_src,
+        "src_lon": grouped["src_lon"].to_numpy(),
+        "src_lat": grouped["src_lat"].to_numpy(),
+        "dst_lon": grouped["dst_lon"].to_numpy(),
+        "dst_lat": grouped["dst_lat"].to_numpy(),
+        "dst_airport": grouped["dst_airport"].cat.codes.to_numpy(),
+    }
 
-    # Load Airports
-    gdf = gpd.read_file(AIRPORT_URL)
-    # Convert to GeoJSON structure
-    airports_data = json.loads(gdf.to_json())
-    print(f"Loaded {len(airports_data['features'])} airports.")
+    # Only airports that appear in a route are used
+    gdf = gdf[gdf["id"].isin(airport_codes)]
+    # The page only needs id, name and location, so ship flat [id, lon, lat, name]
+    # rows instead of GeoJSON features; coordinates rounded to 1e-4 degrees (~11 m)
+    airports_rows = [
+        [airport_id, lon, lat, name]
+        for airport_id, lon, lat, name in zip(
+            gdf["id"].tolist(),
+            gdf.geometry.x.round(4).tolist(),
+            gdf.geometry.y.round(4).tolist(),
+            gdf["name"].tolist(),
+        )
+    ]
+    print(f"Loaded {len(gdf)} airports.")
     
     # Get list of unique source airports with metadata
     # Create a dictionary to hold metadata for each airport code
@@ -40,10 +211,11 @@ def generate_html(output_file="index.html"):
     # We drop duplicates to get unique airport codes
     unique_src = df[['src_airport', 'src_name', 'src_country']].drop_duplicates('src_airport')
     
+    # Sort by code (categories are already sorted, so this sorts the integer codes)
+    unique_src = unique_src.sort_values('src_airport')
+    
     # Convert to list of dictionaries
     src_airports_list = unique_src.to_dict(orient='records')
-    # Sort by code
-    src_airports_list.sort(key=lambda x: x['src_airport'])
     
 
     # HTML Template
@@ -63,6 +235,10 @@ def generate_html(output_file="index.html"):
     <!-- Deck.gl -->
     <script src="https://unpkg.com/deck.gl@8.9.36/dist.min.js"></script>
     
+    <!-- loaders.gl for streaming JSON parsing -->
+    <script src="https://unpkg.com/@loaders.gl/core@3.4.15/dist/dist.min.js"></script>
+    <script src="https://unpkg.com/@loaders.gl/json@3.4.15/dist/dist.min.js"></script>
+    
     <!-- D3 for color scales -->
     <script src="https://d3js.org/d3.v7.min.js"></script>
     
@@ -130,7 +306,7 @@ def generate_html(output_file="index.html"):
     </div>
     
     <div id="stats">
-        Select an airport to see routes.
+        Loading data...
     </div>
     
     <div class="control-group">
@@ -154,10 +330,58 @@ def generate_html(output_file="index.html"):
 <div id="map"></div>
 
 <script>
-    // Embedded Data
-    const ROUTES_DATA = __ROUTES_DATA__;
-    const AIRPORTS_GEOJSON = __AIRPORTS_GEOJSON__;
-    const SRC_AIRPORTS = __SRC_AIRPORTS__; // Now distinct objects: {src_airport, src_name, src_country}
+    // Data files (content-hashed, so they can be cached indefinitely)
+    const ROUTES_URL = "__ROUTES_FILE__";
+    const AIRPORTS_URL = "__AIRPORTS_FILE__";
+    const SRC_AIRPORTS_URL = "__SRC_AIRPORTS_FILE__";
+    
+    // Loaded Data
+    let ROUTES_DATA; // Columnar: {codes, by_src, src_lon, src_lat, dst_lon, dst_lat, dst_airport}
+    let SRC_AIRPORTS; // Distinct objects: {src_airport, src_name, src_country}
+    
+    // Lookups derived from the loaded data
+    let ROUTE_DST_CODE = null;
+    let CODE_INDEX = null;
+    let ROUTE_LAYER_DATA = null;
+    const AIRPORTS_INDEX = new Map(); // Airport id -> {id, name, position}, filled as batches arrive
+    const routeFilter = new deck.DataFilterExtension({filterSize: 1});
+    
+    function indexRoutes() {
+        // Interleaved [lon, lat] typed arrays, handed to deck.gl as binary attributes
+        const count = ROUTES_DATA.src_lon.length;
+        const srcPositions = new Float32Array(count * 2);
+        const dstPositions = new Float32Array(count * 2);
+        for (let i = 0; i < count; i++) {
+            srcPositions[2 * i] = ROUTES_DATA.src_lon[i];
+            srcPositions[2 * i + 1] = ROUTES_DATA.src_lat[i];
+            dstPositions[2 * i] = ROUTES_DATA.dst_lon[i];
+            dstPositions[2 * i + 1] = ROUTES_DATA.dst_lat[i];
+        }
+        // Destination airports as indices into ROUTES_DATA.codes
+        ROUTE_DST_CODE = Int16Array.from(ROUTES_DATA.dst_airport);
+        
+        // Per-route source airport index into ROUTES_DATA.codes, used as the GPU filter value
+        CODE_INDEX = new Map(ROUTES_DATA.codes.map((code, i) => [code, i]));
+        const srcCodes = new Float32Array(count);
+        for (const [code, [start, end]] of Object.entries(ROUTES_DATA.by_src)) {
+            srcCodes.fill(CODE_INDEX.get(code), start, end);
+        }
+        
+        // All routes are uploaded once; selecting an airport only changes filterRange
+        ROUTE_LAYER_DATA = {
+            length: count,
+            attributes: {
+                getSourcePosition: {value: srcPositions, size: 2},
+                getTargetPosition: {value: dstPositions, size: 2},
+                getFilterValue: {value: srcCodes, size: 1}
+            }
+        };
+    }
+    
+    // Row range [start, end) of the routes departing from an airport
+    function getRouteSlice(code) {
+        return ROUTES_DATA.by_src[code] || [0, 0];
+    }
     
     // Initial State
     let currentAirport = "ATL";
@@ -166,21 +390,22 @@ def generate_html(output_file="index.html"):
     const select = document.getElementById('airport-select');
     const statsDiv = document.getElementById('stats');
     
-    // Populate Dropdown
-    SRC_AIRPORTS.forEach(item => {
-        const option = document.createElement('option');
-        option.value = item.src_airport;
-        
-        // Format: CODE - Name, Country
-        // Handle missing names/countries gracefully
-        const name = item.src_name || "Unknown Airport";
-        const country = item.src_country || "";
-        
-        option.text = `${item.src_airport} - ${name}` + (country ? `, ${country}` : "");
-        
-        if (item.src_airport === currentAirport) option.selected = true;
-        select.appendChild(option);
-    });
+    function populateDropdown() {
+        SRC_AIRPORTS.forEach(item => {
+            const option = document.createElement('option');
+            option.value = item.src_airport;
+            
+            // Format: CODE - Name, Country
+            // Handle missing names/countries gracefully
+            const name = item.src_name || "Unknown Airport";
+            const country = item.src_country || "";
+            
+            option.text = `${item.src_airport} - ${name}` + (country ? `, ${country}` : "");
+            
+            if (item.src_airport === currentAirport) option.selected = true;
+            select.appendChild(option);
+        });
+    }
     
     // Initialize MapLibre
     const map = new maplibregl.Map({
@@ -198,65 +423,98 @@ def generate_html(output_file="index.html"):
     let deckOverlay = null;
 
     function getAirportName(code) {
-        // Find name in GeoJSON
-        const feature = AIRPORTS_GEOJSON.features.find(f => f.properties.id === code);
-        return feature ? feature.properties.name : code;
+        const airport = AIRPORTS_INDEX.get(code);
+        return airport ? airport.name : code;
     }
 
-    function updateLayers() {
-        const selectedCode = select.value;
-        const showRoutes = document.getElementById('show-routes').checked;
-        const showAirports = document.getElementById('show-airports').checked;
+    // Recently computed selections, oldest first (Map keeps insertion order)
+    const SELECTION_CACHE_SIZE = 32;
+    const selectionCache = new Map();
+    
+    function getSelection(code) {
+        if (selectionCache.has(code)) {
+            // Move to the back so it is evicted last
+            const cached = selectionCache.get(code);
+            selectionCache.delete(code);
+            selectionCache.set(code, cached);
+            return cached;
+        }
         
-        // Filter Routes
-        const filteredRoutes = ROUTES_DATA.filter(d => d.src_airport === selectedCode);
+        // Routes are the selected airport's row slice
+        const [start, end] = getRouteSlice(code);
+        const selectedIndex = CODE_INDEX.has(code) ? CODE_INDEX.get(code) : -1;
         
         // Filter Connected Airports (Destination + Source)
-        const connectedCodes = new Set(filteredRoutes.map(d => d.dst_airport));
-        connectedCodes.add(selectedCode);
+        const connectedCodes = new Set();
+        for (let i = start; i < end; i++) connectedCodes.add(ROUTES_DATA.codes[ROUTE_DST_CODE[i]]);
+        connectedCodes.add(code);
+        
+        const filteredAirports = [];
+        for (const c of connectedCodes) {
+            const airport = AIRPORTS_INDEX.get(c);
+            if (airport) filteredAirports.push(airport);
+        }
         
-        const filteredAirports = AIRPORTS_GEOJSON.features.filter(f => 
-            connectedCodes.has(f.properties.id)
-        );
+        const selection = {start, end, selectedIndex, connectedCodes, filteredAirports};
+        selectionCache.set(code, selection);
+        if (selectionCache.size > SELECTION_CACHE_SIZE) {
+            selectionCache.delete(selectionCache.keys().next().value);
+        }
+        return selection;
+    }
+
+    function updateLayers(flyToSelection = true) {
+        const selectedCode = select.value;
+        const showRoutes = document.getElementById('show-routes').checked;
+        const showAirports = document.getElementById('show-airports').checked;
+        
+        const {start, end, selectedIndex, connectedCodes, filteredAirports} = getSelection(selectedCode);
         
         // Update Stats
         statsDiv.innerHTML = `
             <strong>${selectedCode}</strong><br>
             ${getAirportName(selectedCode)}<br><br>
-            Routes: ${filteredRoutes.length}<br>
+            Routes: ${end - start}<br>
             Destinations: ${connectedCodes.size - 1}
         `;
+        if (airportsError) {
+            const notice = document.createElement('div');
+            notice.style.color = '#c00';
+            notice.style.marginTop = '10px';
+            notice.textContent = airportsError;
+            statsDiv.appendChild(notice);
+        }
         
         // Deck.gl Layers
         const layers = [];
         
-        if (showRoutes) {
-            layers.push(new deck.ArcLayer({
-                id: 'arc-layer',
-                data: filteredRoutes,
-                getSourcePosition: d => [d.src_lon, d.src_lat],
-                getTargetPosition: d => [d.dst_lon, d.dst_lat],
-                getSourceColor: [100, 0, 150],  // Dark Purple
-                getTargetColor: [255, 255, 0],  // Yellow
-                getWidth: 2,
-                pickable: true,
-                autoHighlight: true
-            }));
-        }
+        // Kept in the layer list when hidden so its GPU buffers survive toggling
+        layers.push(new deck.ArcLayer({
+            id: 'arc-layer',
+            visible: showRoutes,
+            data: ROUTE_LAYER_DATA,
+            extensions: [routeFilter],
+            filterRange: [selectedIndex, selectedIndex],
+            getSourceColor: [100, 0, 150],  // Dark Purple
+            getTargetColor: [255, 255, 0],  // Yellow
+            getWidth: 2,
+            pickable: true,
+            autoHighlight: true
+        }));
         
         if (showAirports) {
             layers.push(new deck.ScatterplotLayer({
                 id: 'airport-layer',
                 data: filteredAirports,
-                getPosition: d => d.geometry.coordinates,
-                getFillColor: d => d.properties.id === selectedCode ? [255, 0, 0] : [0, 128, 255],
-                getRadius: d => d.properties.id === selectedCode ? 10000 : 5000,
+                getPosition: d => d.position,
+                getFillColor: d => d.id === selectedCode ? [255, 0, 0] : [0, 128, 255],
+                getRadius: d => d.id === selectedCode ? 10000 : 5000,
                 pickable: true,
                 autoHighlight: true,
                 onClick: (info) => {
                     if (info.object) {
                         // Optional: Click to select airport if it's a source airport
-                        const clickedCode = info.object.properties.id;
+                        const clickedCode = info.object.id;
                         // Check if valid source airport (exists in list)
                         if (SRC_AIRPORTS.some(x => x.src_airport === clickedCode)) {
                             select.value = clickedCode;
@@ -264,7 +522,7 @@ def generate_html(output_file="index.html"):
                         }
                     }
                 },
-                getTooltip: ({object}) => object && `${object.properties.name} (${object.properties.id})`
+                getTooltip: ({object}) => object && `${object.name} (${object.id})`
             }));
         }
         
@@ -273,9 +531,10 @@ def generate_html(output_file="index.html"):
             deckOverlay = new deck.MapboxOverlay({
                 interleaved: true,
                 layers: layers,
-                getTooltip: ({object}) => object && object.src_airport ? 
-                    `${object.src_airport} -> ${object.dst_airport}` : 
-                    (object && object.properties ? object.properties.name : null)
+                // Binary arc data has no objects; the picked index is the global route row
+                getTooltip: ({layer, index, object}) => layer && layer.id === 'arc-layer' && index >= 0 ? 
+                    `${select.value} -> ${ROUTES_DATA.codes[ROUTE_DST_CODE[index]]}` : 
+                    (object ? object.name : null)
             });
             map.addControl(deckOverlay);
         } else {
@@ -283,10 +542,10 @@ def generate_html(output_file="index.html"):
         }
         
         // Fly to selection
-        const srcFeature = AIRPORTS_GEOJSON.features.find(f => f.properties.id === selectedCode);
-        if (srcFeature) {
+        const srcAirport = AIRPORTS_INDEX.get(selectedCode);
+        if (flyToSelection && srcAirport) {
            map.flyTo({ 
-               center: srcFeature.geometry.coordinates, 
+               center: srcAirport.position, 
                zoom: 4,
                pitch: 30,
                speed: 1.2
@@ -294,14 +553,91 @@ def generate_html(output_file="index.html"):
         }
     }
     
-    // Event Listeners
-    select.addEventListener('change', updateLayers);
-    document.getElementById('show-routes').addEventListener('change', updateLayers);
-    document.getElementById('show-airports').addEventListener('change', updateLayers);
+    // Set once the map and the route data are both loaded
+    let ready = false;
+    
+    // Shown under the stats when the airports file failed to load
+    let airportsError = null;
+    
+    // Fetch a data file, treating HTTP errors (e.g. a file that wasn't deployed) as failures
+    function fetchData(url) {
+        return fetch(url).then(r => {
+            if (!r.ok) throw new Error(`${url}: HTTP ${r.status}`);
+            return r;
+        });
+    }
+    
+    function showError(message, err) {
+        console.error(message, err);
+        statsDiv.textContent = message;
+    }
+    
+    // Coalesce re-renders from incoming airport batches to one per frame
+    let refreshPending = false;
+    let flyPending = false;
+    function scheduleRefresh(fly) {
+        flyPending = flyPending || fly;
+        if (refreshPending) return;
+        refreshPending = true;
+        requestAnimationFrame(() => {
+            refreshPending = false;
+            const flyNow = flyPending;
+            flyPending = false;
+            // Before the first render nothing is drawn; that render flies to the selection itself
+            if (!ready) return;
+            updateLayers(flyNow);
+        });
+    }
     
-    // Initial Render
+    // Stream airport rows in batches so routes render before the whole file is parsed
+    async function streamAirports() {
+        const batches = await loaders.parseInBatches(fetchData(AIRPORTS_URL), loaders.JSONLoader, {
+            json: {jsonpaths: ['$.airports']}
+        });
+        for await (const batch of batches) {
+            const hadSelected = AIRPORTS_INDEX.has(select.value);
+            for (const [id, lon, lat, name] of batch.data) {
+                AIRPORTS_INDEX.set(id, {id, name, position: [lon, lat]});
+            }
+            // Cached selections may be missing airports from this batch
+            selectionCache.clear();
+            // Fly to the selected airport as soon as its location arrives
+            scheduleRefresh(!hadSelected && AIRPORTS_INDEX.has(select.value));
+        }
+    }
+    streamAirports().catch(err => {
+        // Routes still work without airports, so keep the stats and add a notice
+        console.error('Failed to load airports', err);
+        airportsError = 'Failed to load airports; locations and names may be missing.';
+        scheduleRefresh(false);
+    });
+    
+    // Fetch the remaining data files in parallel, while the map style is still loading
+    const dataLoaded = Promise.all([
+        fetchData(ROUTES_URL).then(r => r.json()),
+        fetchData(SRC_AIRPORTS_URL).then(r => r.json())
+    ]).then(([routes, srcAirports]) => {
+        ROUTES_DATA = routes;
+        SRC_AIRPORTS = srcAirports;
+        indexRoutes();
+        populateDropdown();
+    });
+    // Report failures right away instead of leaving the panel on "Loading data..."
+    dataLoaded.catch(err => showError('Failed to load route data.', err));
+    
+    // Initial Render, once both the map and the route data are ready
     map.on('load', () => {
-        updateLayers();
+        dataLoaded.then(() => {
+            // Event Listeners
+            select.addEventListener('change', () => updateLayers());
+            document.getElementById('show-routes').addEventListener('change', () => updateLayers());
+            document.getElementById('show-airports').addEventListener('change', () => updateLayers());
+            
+            ready = true;
+            updateLayers();
+        }, () => {
+            // Load failure was already reported above
+        }).catch(err => showError('Failed to draw the map.', err));
     });
 
 </script>
@@ -310,16 +646,34 @@ def generate_html(output_file="index.html"):
 </html>
     """
     
-    # Inject data
-    html_content = html_content.replace("__ROUTES_DATA__", str(routes_data))
-    html_content = html_content.replace("__AIRPORTS_GEOJSON__", json.dumps(airports_data))
-    html_content = html_content.replace("__SRC_AIRPORTS__", json.dumps(src_airports_list))
+    # Write data files next to the page, named by content hash
+    output_dir = os.path.dirname(os.path.abspath(output_file))
+    # orjson serializes in C and emits valid JSON (null instead of NaN, double-quoted strings)
+    routes_file = write_asset(output_dir, "routes", ".json",
+                              orjson.dumps(routes_data, option=orjson.OPT_SERIALIZE_NUMPY))
+    # Rows sit under one key so the page can stream-parse the array
+    airports_file = write_asset(output_dir, "airports", ".json", orjson.dumps({"airports": airports_rows}))
+    src_airports_file = write_asset(output_dir, "src_airports", ".json", orjson.dumps(src_airports_list))
+    
+    # Inject data file names
+    html_content = html_content.replace("__ROUTES_FILE__", routes_file)
+    html_content = html_content.replace("__AIRPORTS_FILE__", airports_file)
+    html_content = html_content.replace("__SRC_AIRPORTS_FILE__", src_airports_file)
 
     
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(html_content)
+    write_output(output_file, html_content.encode("utf-8"))
+    
+    # Serve the output directory as-is on GitHub Pages (no Jekyll processing)
+    open(os.path.join(output_dir, ".nojekyll"), "w").close()
     
-    print(f"Successfully generated {output_file} ({len(html_content)/1024/1024:.2f} MB)")
+    # Report the whole payload: the page itself is only a small shell around the data files
+    output_paths = [output_file] + [
+        os.path.join(output_dir, name) for name in (routes_file, airports_file, src_airports_file)
+    ]
+    raw_size = sum(os.path.getsize(path) for path in output_paths)
+    br_size = sum(os.path.getsize(path + ".br") for path in output_paths)
+    print(f"Successfully generated {output_file} and {len(output_paths) - 1} data files "
+          f"({raw_size/1024/1024:.2f} MB total, {br_size/1024/1024:.2f} MB brotli)")
 
 if __name__ == "__main__":
     generate_html()